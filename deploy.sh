@@ -127,7 +127,7 @@ EOF
 # Setup Supervisor for Celery Worker
 cat > /etc/supervisor/conf.d/${SERVICE_NAME}_celery.conf << EOF
 [program:${SERVICE_NAME}_celery]
-command=$PROJECT_DIR/venv/bin/celery -A digitalboda_backend worker --loglevel=info
+command=$PROJECT_DIR/venv/bin/celery -A digitalboda_backend worker -Q celery,photo_verification --loglevel=info
 directory=$PROJECT_DIR
 user=$USER
 autostart=true
@@ -0,0 +1,18 @@
+"""
+Celery application for digitalboda_backend.
+
+Workers are started with ``celery -A digitalboda_backend worker`` (see Procfile).
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'digitalboda_backend.settings')
+# Photo verification runs its checks on a thread pool; keep Tesseract's own OpenMP
+# threads from oversubscribing the cores
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+app = Celery('digitalboda_backend')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -169,6 +170,51 @@ if not DEBUG:
 ID_ENCRYPTION_KEY = os.getenv('ID_ENCRYPTION_KEY', '')
 ID_HASH_SALT = os.getenv('ID_HASH_SALT', 'default-salt-change-this')
 
+# PIN hashing pepper (HMAC key for rider PIN hashes; changing it invalidates existing PINs).
+# PIN hashes are fast, so the pepper is their only protection: never fall back to a
+# public value outside development
+PIN_PEPPER = os.getenv('PIN_PEPPER', '')
+if not PIN_PEPPER:
+    if not DEBUG:
+        raise ImproperlyConfigured("You must set PIN_PEPPER in your environment file")
+    PIN_PEPPER = 'development-pepper-not-secret'
+
+# Legacy bcrypt PINs are only re-hashed to HMAC under a pepper from the environment
+PIN_REHASH_LEGACY = bool(os.getenv('PIN_PEPPER'))
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# Cache shared by gunicorn and the Celery workers, so invalidation in one process
+# (e.g. a photo verification finishing on a worker) is seen by all of them
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'digitalboda',
+    },
+    # Face encodings keyed by photo SHA-256; kept for a week so re-verifications
+    # skip face detection across worker restarts
+    'face_encodings': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'digitalboda_face_encodings',
+        'TIMEOUT': 7 * 24 * 60 * 60,
+    },
+}
+
+# Celery (background tasks); photo verification runs on its own queue so OCR and
+# face matching cannot starve notification tasks
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_RESULT_EXPIRES = 24 * 60 * 60
+CELERY_TASK_ROUTES = {
+    'riders.tasks.verify_rider_photos_task': {'queue': 'photo_verification'},
+}
+
 # SECURITY: Logging configuration
 LOGGING = {
     'version': 1,
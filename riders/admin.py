@@ -1,5 +1,6 @@
 # Django Admin - Organized Digital Literacy Training Management
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from django.shortcuts import render
 from django.http import HttpResponse
@@ -37,6 +38,7 @@ class RiderAdmin(admin.ModelAdmin):
     list_filter = ['status', 'experience_level', 'created_at', 'assigned_enumerator']
     search_fields = ['first_name', 'last_name', 'phone_number', 'unique_id']
     readonly_fields = ['unique_id', 'created_at', 'updated_at', 'approved_at', 'approved_by']
+    show_full_result_count = False  # skip the extra unfiltered COUNT(*) on filtered pages
     
     fieldsets = (
         ('Personal Information', {
@@ -181,6 +183,7 @@ class SessionScheduleAdmin(admin.ModelAdmin):
         'session', 'trainer', 'scheduled_date', 'location_name',
         'capacity', 'status_badge', 'created_at'
     ]
+    list_select_related = ['session__module', 'trainer']
     list_display_links = ['session']
     list_filter = ['status', 'scheduled_date', 'trainer', 'session__module']
     search_fields = [
@@ -210,6 +213,7 @@ class SessionAttendanceAdmin(admin.ModelAdmin):
         'rider', 'session_info', 'trainer', 'status_badge',
         'registration_time', 'check_in_time'
     ]
+    list_select_related = ['rider', 'schedule__session__module', 'schedule__trainer']
     list_display_links = ['rider']
     list_filter = [
         'status', 'schedule__status', 'schedule__trainer',
@@ -271,8 +275,11 @@ class StageAdmin(admin.ModelAdmin):
         )
     status_badge.short_description = 'Status'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(rider_assignment_count=Count('rider_assignments'))
+    
     def rider_count(self, obj):
-        count = obj.rider_assignments.count()
+        count = obj.rider_assignment_count
         return format_html(
             '<span style="background: #3498DB; color: white; padding: 4px 8px; border-radius: 12px; font-size: 11px;">👥 {}</span>',
             count
@@ -8,11 +8,16 @@ from django.conf import settings
 from django.db import models
 from django.core.exceptions import ValidationError
 import base64
+import functools
 import hashlib
 import logging
+import re
 
 logger = logging.getLogger('riders')
 
+# Uganda National ID: CF/CM followed by 12-13 ASCII digits
+UGANDA_ID_PATTERN = re.compile(r'C[FM][0-9]{12,13}')
+
 class IDEncryption:
     """Service for encrypting/decrypting ID numbers and creating verification hashes"""
     
@@ -98,19 +103,14 @@ class IDEncryption:
         if not id_number:
             return False
             
-        # Remove any whitespace
-        id_number = id_number.strip()
-        
-        # Uganda National ID is typically 14-15 characters (CF/CM + 12-13 digits)
-        if len(id_number) < 14 or len(id_number) > 15:
-            return False
-        
-        # Uganda ID format: CF + 11-12 digits OR CM + 11-12 digits
-        if not (id_number.startswith('CF') or id_number.startswith('CM')):
-            return False
-        
-        # Check if remaining characters are digits
-        return id_number[2:].isdigit()
+        # Uganda National ID is 14-15 characters (CF/CM + 12-13 digits)
+        return UGANDA_ID_PATTERN.fullmatch(id_number.strip()) is not None
+
+
+@functools.cache
+def get_id_encryptor():
+    """Return the shared IDEncryption instance, building the Fernet cipher once per process"""
+    return IDEncryption()
 
 
 class EncryptedIDField(models.TextField):
@@ -119,7 +119,7 @@ class EncryptedIDField(models.TextField):
     """
     
     def __init__(self, *args, **kwargs):
-        self.encryptor = IDEncryption()
+        self.encryptor = get_id_encryptor()
         super().__init__(*args, **kwargs)
     
     def get_prep_value(self, value):
@@ -57,8 +57,7 @@ class Command(BaseCommand):
         )
         
         if enum_created:
-            # Generate unique ID
-            enumerator.generate_unique_id()
+            # Enumerator.save() already allocated and saved the unique ID
             self.stdout.write(f"✅ Created enumerator: {enumerator.full_name} ({enumerator.unique_id})")
         else:
             self.stdout.write(f"👤 Enumerator already exists: {enumerator.full_name} ({enumerator.unique_id})")
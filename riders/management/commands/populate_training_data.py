@@ -403,21 +403,26 @@ class Command(BaseCommand):
             }
         ]
 
-        # Create modules and sessions
+        # Create or update modules and sessions; titles and (module, session_number)
+        # are unique, so re-running without --clear updates the existing rows
         for module_data in modules_data:
             sessions_data = module_data.pop('sessions')
             
-            module = DigitalLiteracyModule.objects.create(**module_data)
-            self.stdout.write(f'✅ Created module: {module.title}')
+            module, created = DigitalLiteracyModule.objects.update_or_create(
+                title=module_data.pop('title'),
+                defaults=module_data
+            )
+            self.stdout.write(f'✅ {"Created" if created else "Updated"} module: {module.title}')
             
             total_duration = 0
             for session_data in sessions_data:
-                session = TrainingSession.objects.create(
+                session, created = TrainingSession.objects.update_or_create(
                     module=module,
-                    **session_data
+                    session_number=session_data.pop('session_number'),
+                    defaults=session_data
                 )
                 total_duration += float(session_data['duration_hours'])
-                self.stdout.write(f'   📚 Created session: {session.title}')
+                self.stdout.write(f'   📚 {"Created" if created else "Updated"} session: {session.title}')
             
             # Update module totals
             module.session_count = len(sessions_data)
@@ -426,7 +431,7 @@ class Command(BaseCommand):
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'\n🎉 Successfully created {DigitalLiteracyModule.objects.count()} '
+                f'\n🎉 Successfully populated {DigitalLiteracyModule.objects.count()} '
                 f'training modules with {TrainingSession.objects.count()} sessions!'
             )
         )
@@ -456,9 +461,13 @@ class Command(BaseCommand):
             ]
             
             # Create schedules for the first few sessions
-            sessions = TrainingSession.objects.filter(
+            sessions = list(TrainingSession.objects.filter(
                 module__order__lte=2, session_number__lte=2
-            )[:6]
+            )[:6])
+            
+            if SessionSchedule.objects.filter(session__in=sessions).exists():
+                self.stdout.write('   Sample schedules already exist, skipping.')
+                sessions = []
             
             for i, session in enumerate(sessions):
                 location = locations[i % len(locations)]
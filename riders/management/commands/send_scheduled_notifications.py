@@ -98,10 +98,10 @@ class Command(BaseCommand):
         upcoming_sessions = SessionSchedule.objects.filter(
             scheduled_date__gte=timezone.now(),
             scheduled_date__lte=timezone.now() + timedelta(days=7),
-            status='scheduled'
+            status='SCHEDULED'
         ).exclude(
             notificationschedule__isnull=False
-        )
+        ).select_related('session')
         
         total_reminders = 0
         for session in upcoming_sessions:
@@ -0,0 +1,61 @@
+# Store age_bracket as a small integer code instead of a varchar label
+
+from django.db import migrations, models
+
+
+AGE_BRACKET_CODES = {
+    '18-23': '0',
+    '24-29': '1',
+    '30-35': '2',
+    '36-41': '3',
+    '42-47': '4',
+    '48-53': '5',
+    '54-59': '6',
+    '60-65': '7',
+    '66+': '8',
+}
+
+
+def labels_to_codes(apps, schema_editor):
+    # Rewrite the labels in place so the column type change below is a plain cast
+    Rider = apps.get_model('riders', 'Rider')
+    for label, code in AGE_BRACKET_CODES.items():
+        Rider.objects.filter(age_bracket=label).update(age_bracket=code)
+    Rider.objects.exclude(age_bracket__in=AGE_BRACKET_CODES.values()).update(age_bracket=None)
+
+
+def codes_to_labels(apps, schema_editor):
+    Rider = apps.get_model('riders', 'Rider')
+    for label, code in AGE_BRACKET_CODES.items():
+        Rider.objects.filter(age_bracket=code).update(age_bracket=label)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0013_add_pin_and_age_bracket_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(labels_to_codes, codes_to_labels),
+        migrations.AlterField(
+            model_name='rider',
+            name='age_bracket',
+            field=models.SmallIntegerField(
+                blank=True,
+                choices=[
+                    (0, '18-23 (Young Adult)'),
+                    (1, '24-29 (Early Career)'),
+                    (2, '30-35 (Mid Career)'),
+                    (3, '36-41 (Experienced)'),
+                    (4, '42-47 (Senior)'),
+                    (5, '48-53 (Veteran)'),
+                    (6, '54-59 (Pre-retirement)'),
+                    (7, '60-65 (Senior Citizen)'),
+                    (8, '66+ (Elder)'),
+                ],
+                help_text='Age bracket instead of exact age for privacy',
+                null=True
+            ),
+        ),
+    ]
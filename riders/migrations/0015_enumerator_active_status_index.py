@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0014_rider_age_bracket_smallint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enumerator',
+            index=models.Index(condition=models.Q(('status', 'ACTIVE')), fields=['status'], name='enum_status_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:04
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def dedupe_module_titles(apps, schema_editor):
+    # Keep the earliest module per title before adding the constraint. Later copies
+    # (e.g. from re-running populate_training_data) are deleted when nothing but their
+    # own sessions refers to them; copies with schedules, progress or notifications
+    # are renamed instead so that training history is not cascaded away.
+    DigitalLiteracyModule = apps.get_model('riders', 'DigitalLiteracyModule')
+    SessionSchedule = apps.get_model('riders', 'SessionSchedule')
+    DigitalLiteracyProgress = apps.get_model('riders', 'DigitalLiteracyProgress')
+    NotificationSchedule = apps.get_model('riders', 'NotificationSchedule')
+
+    duplicates = (
+        DigitalLiteracyModule.objects.values('title')
+        .annotate(keep_id=Min('id'), copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    for duplicate in duplicates:
+        extra_modules = DigitalLiteracyModule.objects.filter(
+            title=duplicate['title']
+        ).exclude(id=duplicate['keep_id'])
+        for module in extra_modules:
+            in_use = (
+                SessionSchedule.objects.filter(session__module=module).exists()
+                or DigitalLiteracyProgress.objects.filter(module=module).exists()
+                or NotificationSchedule.objects.filter(module=module).exists()
+            )
+            if in_use:
+                suffix = f' (duplicate {module.id})'
+                module.title = module.title[:200 - len(suffix)] + suffix
+                module.save(update_fields=['title'])
+            else:
+                module.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0015_enumerator_active_status_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_module_titles, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='digitalliteracymodule',
+            name='title',
+            field=models.CharField(max_length=200, unique=True),
+        ),
+    ]
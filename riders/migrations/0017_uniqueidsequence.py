@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0016_digitalliteracymodule_title_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UniqueIDSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=4)),
+                ('year', models.PositiveIntegerField()),
+                ('last_number', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('prefix', 'year')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0017_uniqueidsequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rider',
+            index=models.Index(fields=['assigned_enumerator', 'status'], name='rider_enum_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rider',
+            index=models.Index(condition=models.Q(('id_verification_status', 'PENDING')), fields=['id_verification_status'], name='rider_id_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rider',
+            index=models.Index(condition=models.Q(('photo_verification_status', 'PENDING')), fields=['photo_verification_status'], name='rider_photo_pending_idx'),
+        ),
+    ]
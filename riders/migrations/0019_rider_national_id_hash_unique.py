@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0018_rider_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='rider',
+            name='national_id_hash',
+            field=models.CharField(blank=True, help_text='Hash for duplicate detection', max_length=64, null=True, unique=True),
+        ),
+    ]
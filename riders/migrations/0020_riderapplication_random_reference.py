@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:12
+
+import riders.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0019_rider_national_id_hash_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='riderapplication',
+            name='reference_number',
+            field=models.CharField(default=riders.models.generate_reference_number, max_length=20, unique=True),
+        ),
+    ]
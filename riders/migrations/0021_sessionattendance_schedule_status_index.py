@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0020_riderapplication_random_reference'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sessionattendance',
+            index=models.Index(fields=['schedule', 'status'], name='sessattend_sched_status_idx'),
+        ),
+    ]
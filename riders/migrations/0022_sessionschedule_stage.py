@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_schedules_to_stages(apps, schema_editor):
+    # Existing schedules were matched to stages by location_name containing the stage name
+    Stage = apps.get_model('riders', 'Stage')
+    SessionSchedule = apps.get_model('riders', 'SessionSchedule')
+    for stage_id, name in Stage.objects.values_list('id', 'name'):
+        SessionSchedule.objects.filter(
+            stage__isnull=True, location_name__icontains=name
+        ).update(stage_id=stage_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0021_sessionattendance_schedule_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sessionschedule',
+            name='stage',
+            field=models.ForeignKey(blank=True, help_text='Stage where the session is held', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='session_schedules', to='riders.stage'),
+        ),
+        migrations.RunPython(link_schedules_to_stages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:17
+
+from django.db import migrations
+from django.db.models import Min
+
+
+def drop_duplicate_reminders(apps, schema_editor):
+    # Keep the earliest reminder of each type per rider and session before adding the constraint
+    NotificationSchedule = apps.get_model('riders', 'NotificationSchedule')
+    keep_ids = (
+        NotificationSchedule.objects.filter(session_schedule__isnull=False)
+        .values('rider', 'session_schedule', 'notification_type')
+        .annotate(keep_id=Min('id'))
+        .values_list('keep_id', flat=True)
+    )
+    NotificationSchedule.objects.filter(session_schedule__isnull=False).exclude(
+        id__in=list(keep_ids)
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0022_sessionschedule_stage'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_reminders, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='notificationschedule',
+            unique_together={('rider', 'session_schedule', 'notification_type')},
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0023_notificationschedule_unique_reminder'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notificationschedule',
+            name='riders_noti_schedul_73cf39_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notificationschedule',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['scheduled_time'], name='notif_pending_time_idx'),
+        ),
+    ]
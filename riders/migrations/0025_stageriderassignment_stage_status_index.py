@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0024_notificationschedule_pending_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stageriderassignment',
+            index=models.Index(fields=['stage', 'status'], name='stageassign_stage_status_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0025_stageriderassignment_stage_status_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rider',
+            index=models.Index(fields=['assigned_enumerator', 'status', '-created_at'], name='rider_enum_status_created_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='rider',
+            name='rider_enum_status_idx',
+        ),
+    ]
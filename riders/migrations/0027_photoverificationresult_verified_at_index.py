@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0026_rider_enum_status_created_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='photoverificationresult',
+            index=models.Index(condition=models.Q(('verified_at__isnull', False)), fields=['-verified_at'], name='photoverif_verified_at_idx'),
+        ),
+    ]
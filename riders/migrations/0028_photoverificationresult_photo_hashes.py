@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0027_photoverificationresult_verified_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photoverificationresult',
+            name='id_photo_sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='photoverificationresult',
+            name='profile_photo_sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
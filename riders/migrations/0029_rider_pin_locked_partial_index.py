@@ -0,0 +1,45 @@
+# Partial index on Rider.pin_locked_until, built without locking riders_rider
+
+from django.db import migrations, models
+
+
+def create_pin_lock_index(apps, schema_editor):
+    # CONCURRENTLY avoids blocking rider writes while the index builds (PostgreSQL only);
+    # IF NOT EXISTS covers databases that already built it from an earlier 0013
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f'CREATE INDEX {concurrently}IF NOT EXISTS rider_pin_locked_partial '
+        'ON riders_rider (pin_locked_until) WHERE pin_locked_until IS NOT NULL'
+    )
+
+
+def drop_pin_lock_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS rider_pin_locked_partial')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('riders', '0028_photoverificationresult_photo_hashes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='rider',
+                    index=models.Index(
+                        condition=models.Q(pin_locked_until__isnull=False),
+                        fields=['pin_locked_until'],
+                        name='rider_pin_locked_partial',
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_pin_lock_index, drop_pin_lock_index),
+            ],
+        ),
+    ]
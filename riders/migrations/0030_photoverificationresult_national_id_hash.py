@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0029_rider_pin_locked_partial_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photoverificationresult',
+            name='national_id_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
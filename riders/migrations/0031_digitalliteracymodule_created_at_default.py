@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0030_photoverificationresult_national_id_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='digitalliteracymodule',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -1,9 +1,61 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
+from django.db.models.functions import Length
 from django.utils import timezone
 import uuid
+import base64
+from functools import cached_property
 import hashlib
-from .encryption import EncryptedIDField, IDEncryption, log_id_access
+import hmac
+import math
+import secrets
+from .encryption import EncryptedIDField, get_id_encryptor, log_id_access
+
+
+class UniqueIDSequence(models.Model):
+    """Per-year counters used to allocate EN-YYYY-NNNN / DB-YYYY-NNNN profile IDs"""
+    prefix = models.CharField(max_length=4)
+    year = models.PositiveIntegerField()
+    last_number = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['prefix', 'year']
+
+    def __str__(self):
+        return f"{self.prefix}-{self.year}: {self.last_number}"
+
+    @classmethod
+    def next_id(cls, prefix, year, model):
+        """
+        Allocate the next ID for prefix/year under a row lock
+        
+        Args:
+            prefix (str): ID prefix ('EN' or 'DB')
+            year (int): Allocation year
+            model: Model owning the unique_id column, used to seed a new counter
+            
+        Returns:
+            str: Formatted unique ID, e.g. DB-2025-0042
+        """
+        with transaction.atomic():
+            sequence, _ = cls.objects.select_for_update().get_or_create(
+                prefix=prefix,
+                year=year,
+                defaults={'last_number': lambda: cls._highest_issued(prefix, year, model)},
+            )
+            sequence.last_number += 1
+            sequence.save(update_fields=['last_number'])
+        return f'{prefix}-{year}-{sequence.last_number:04d}'
+
+    @staticmethod
+    def _highest_issued(prefix, year, model):
+        """Highest number already issued before the counter existed (runs once per prefix/year)"""
+        # Zero-padded suffixes sort numerically once longer IDs (past 9999) come first
+        last = model.objects.filter(
+            unique_id__startswith=f'{prefix}-{year}-'
+        ).order_by(Length('unique_id').desc(), '-unique_id').values_list('unique_id', flat=True).first()
+        suffix = last.rsplit('-', 1)[1] if last else ''
+        return int(suffix) if suffix.isdigit() else 0
 
 
 class Enumerator(models.Model):
@@ -67,11 +119,19 @@ class Enumerator(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Trainer pickers and dashboards only ever look up active enumerators
+            models.Index(
+                fields=['status'],
+                name='enum_status_idx',
+                condition=models.Q(status='ACTIVE'),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.unique_id})"
 
-    @property
+    @cached_property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -83,33 +143,20 @@ class Enumerator(models.Model):
 
     def generate_unique_id(self):
         """Generate a unique enumerator ID in format EN-YYYY-NNNN"""
-        from django.utils import timezone
-        current_year = timezone.now().year
-        
-        # Count existing enumerators with unique IDs this year
-        existing_count = Enumerator.objects.filter(
-            unique_id__startswith=f'EN-{current_year}-',
-            unique_id__isnull=False
-        ).exclude(unique_id='').count()
-        
-        # Generate next sequential number
-        next_number = existing_count + 1
-        unique_id = f'EN-{current_year}-{next_number:04d}'
-        
-        # Ensure uniqueness
-        while Enumerator.objects.filter(unique_id=unique_id).exists():
-            next_number += 1
-            unique_id = f'EN-{current_year}-{next_number:04d}'
-            
-        self.unique_id = unique_id
+        self.unique_id = UniqueIDSequence.next_id('EN', timezone.now().year, Enumerator)
 
     def get_assigned_riders(self):
         """Get all riders assigned to this enumerator"""
-        return self.assigned_riders.all()
+        return self.assigned_riders.for_list()
 
     def get_pending_riders(self):
         """Get riders pending approval by this enumerator"""
-        return self.assigned_riders.filter(status=Rider.PENDING_APPROVAL)
+        return self.get_assigned_riders().filter(status=Rider.PENDING_APPROVAL)
+
+class RiderQuerySet(models.QuerySet):
+    def for_list(self):
+        """Join the application and enumerator that rider listings read, skip the FCM token"""
+        return self.select_related('application', 'assigned_enumerator').defer('fcm_token')
 
 class Rider(models.Model):
     # Status choices for the enhanced workflow
@@ -168,20 +215,31 @@ class Rider(models.Model):
     # Personal Details
     # Age brackets instead of exact age
     AGE_BRACKET_CHOICES = [
-        ('18-23', '18-23 (Young Adult)'),
-        ('24-29', '24-29 (Early Career)'),
-        ('30-35', '30-35 (Mid Career)'),
-        ('36-41', '36-41 (Experienced)'),
-        ('42-47', '42-47 (Senior)'),
-        ('48-53', '48-53 (Veteran)'),
-        ('54-59', '54-59 (Pre-retirement)'),
-        ('60-65', '60-65 (Senior Citizen)'),
-        ('66+', '66+ (Elder)'),
+        (0, '18-23 (Young Adult)'),
+        (1, '24-29 (Early Career)'),
+        (2, '30-35 (Mid Career)'),
+        (3, '36-41 (Experienced)'),
+        (4, '42-47 (Senior)'),
+        (5, '48-53 (Veteran)'),
+        (6, '54-59 (Pre-retirement)'),
+        (7, '60-65 (Senior Citizen)'),
+        (8, '66+ (Elder)'),
     ]
+    AGE_BRACKET_LABEL = {
+        0: '18-23',
+        1: '24-29',
+        2: '30-35',
+        3: '36-41',
+        4: '42-47',
+        5: '48-53',
+        6: '54-59',
+        7: '60-65',
+        8: '66+',
+    }
+    AGE_BRACKET_BY_LABEL = {label: value for value, label in AGE_BRACKET_LABEL.items()}
     
     age = models.IntegerField(blank=True, null=True)  # DEPRECATED: Keep for migration
-    age_bracket = models.CharField(
-        max_length=10,
+    age_bracket = models.SmallIntegerField(
         choices=AGE_BRACKET_CHOICES,
         blank=True,
         null=True,
@@ -195,6 +253,12 @@ class Rider(models.Model):
     )
     
     # PIN Authentication
+    # PINs are stored as HMAC-SHA256(PIN_PEPPER, salt + pin): a 4-6 digit PIN has at
+    # most 10^6 values, so the secret pepper and the lockout after failed attempts
+    # are the real defence, not a slow hash. Hashes without the prefix are legacy bcrypt.
+    PIN_HASH_PREFIX = 'hmac$'
+    MAX_PIN_ATTEMPTS = 5
+    
     pin_hash = models.CharField(
         max_length=128, 
         blank=True, 
@@ -212,7 +276,7 @@ class Rider(models.Model):
     
     # SECURITY: Encrypted ID storage
     # national_id_encrypted = EncryptedIDField(blank=True, null=True, help_text="Encrypted ID number")
-    national_id_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True, 
+    national_id_hash = models.CharField(max_length=64, blank=True, null=True, unique=True, 
                                        help_text="Hash for duplicate detection")
     
     # ID verification status
@@ -262,38 +326,42 @@ class Rider(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = RiderQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Enumerator review queues: assigned riders filtered by status, newest first
+            models.Index(fields=['assigned_enumerator', 'status', '-created_at'], name='rider_enum_status_created_idx'),
+            # Verification queues only ever look at the pending subset
+            models.Index(
+                fields=['id_verification_status'],
+                name='rider_id_pending_idx',
+                condition=models.Q(id_verification_status='PENDING'),
+            ),
+            models.Index(
+                fields=['photo_verification_status'],
+                name='rider_photo_pending_idx',
+                condition=models.Q(photo_verification_status='PENDING'),
+            ),
+            # Only locked-out riders carry pin_locked_until, keep the index small
+            models.Index(
+                fields=['pin_locked_until'],
+                name='rider_pin_locked_partial',
+                condition=models.Q(pin_locked_until__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.phone_number})"
 
-    @property
+    @cached_property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
     def generate_unique_id(self):
-        """Generate a unique profile ID in format DB-YYYY-NNNN"""
-        from django.utils import timezone
-        current_year = timezone.now().year
-        
-        # Count existing riders with unique IDs this year
-        existing_count = Rider.objects.filter(
-            unique_id__startswith=f'DB-{current_year}-',
-            unique_id__isnull=False
-        ).count()
-        
-        # Generate next sequential number
-        next_number = existing_count + 1
-        unique_id = f'DB-{current_year}-{next_number:04d}'
-        
-        # Ensure uniqueness
-        while Rider.objects.filter(unique_id=unique_id).exists():
-            next_number += 1
-            unique_id = f'DB-{current_year}-{next_number:04d}'
-            
-        self.unique_id = unique_id
-        self.save()
+        """Generate a unique profile ID in format DB-YYYY-NNNN (saved by the caller)"""
+        self.unique_id = UniqueIDSequence.next_id('DB', timezone.now().year, Rider)
     
     def set_national_id(self, id_number, accessed_by=None, reason=None, request=None):
         """
@@ -307,35 +375,43 @@ class Rider(models.Model):
         """
         if not id_number:
             return False
+        
+        meta = getattr(request, 'META', None) or {}
+        ip_address, user_agent = meta.get('REMOTE_ADDR'), meta.get('HTTP_USER_AGENT')
             
         # Validate ID format
-        encryptor = IDEncryption()
+        encryptor = get_id_encryptor()
         if not encryptor.validate_id_format(id_number):
             log_id_access(self, accessed_by, 'SET_ID', f"{reason} - INVALID FORMAT", 
                          success=False, 
-                         ip_address=getattr(request, 'META', {}).get('REMOTE_ADDR'),
-                         user_agent=getattr(request, 'META', {}).get('HTTP_USER_AGENT'))
+                         ip_address=ip_address,
+                         user_agent=user_agent)
             raise ValueError("Invalid Uganda National ID format")
         
-        # Check for duplicates using hash
+        # Store the hash; the unique constraint on national_id_hash rejects duplicates
         id_hash = encryptor.hash_id_for_verification(id_number)
-        if Rider.objects.filter(national_id_hash=id_hash).exclude(pk=self.pk).exists():
+        try:
+            with transaction.atomic():
+                Rider.objects.filter(pk=self.pk).update(
+                    national_id_hash=id_hash,
+                    id_verification_status='PENDING',
+                )
+        except IntegrityError:
             log_id_access(self, accessed_by, 'SET_ID', f"{reason} - DUPLICATE", 
                          success=False,
-                         ip_address=getattr(request, 'META', {}).get('REMOTE_ADDR'),
-                         user_agent=getattr(request, 'META', {}).get('HTTP_USER_AGENT'))
+                         ip_address=ip_address,
+                         user_agent=user_agent)
             raise ValueError("This ID number is already registered")
         
         # Set encrypted ID and hash
         self.national_id_encrypted = id_number  # Will be encrypted by EncryptedIDField
         self.national_id_hash = id_hash
         self.id_verification_status = 'PENDING'
-        self.save(update_fields=['national_id_encrypted', 'national_id_hash', 'id_verification_status'])
         
         # Log successful access
         log_id_access(self, accessed_by, 'SET_ID', reason,
-                     ip_address=getattr(request, 'META', {}).get('REMOTE_ADDR'),
-                     user_agent=getattr(request, 'META', {}).get('HTTP_USER_AGENT'))
+                     ip_address=ip_address,
+                     user_agent=user_agent)
         
         return True
     
@@ -353,24 +429,30 @@ class Rider(models.Model):
         """
         if not self.national_id_encrypted:
             return None
+        
+        meta = getattr(request, 'META', None) or {}
+        ip_address, user_agent = meta.get('REMOTE_ADDR'), meta.get('HTTP_USER_AGENT')
             
         # Check authorization
         if not self._authorize_id_access(accessed_by, reason):
             log_id_access(self, accessed_by, 'UNAUTHORIZED_ACCESS', reason, 
                          success=False,
-                         ip_address=getattr(request, 'META', {}).get('REMOTE_ADDR'),
-                         user_agent=getattr(request, 'META', {}).get('HTTP_USER_AGENT'))
+                         ip_address=ip_address,
+                         user_agent=user_agent)
             raise PermissionError("Unauthorized access to ID data")
         
-        # Update access tracking
+        # Update access tracking once the surrounding transaction commits
         self.id_last_accessed = timezone.now()
         self.id_access_count += 1
-        self.save(update_fields=['id_last_accessed', 'id_access_count'])
+        transaction.on_commit(lambda: Rider.objects.filter(pk=self.pk).update(
+            id_last_accessed=self.id_last_accessed,
+            id_access_count=models.F('id_access_count') + 1,
+        ))
         
         # Log access
         log_id_access(self, accessed_by, 'VIEW_ID', reason,
-                     ip_address=getattr(request, 'META', {}).get('REMOTE_ADDR'),
-                     user_agent=getattr(request, 'META', {}).get('HTTP_USER_AGENT'))
+                     ip_address=ip_address,
+                     user_agent=user_agent)
         
         # Return decrypted ID (EncryptedIDField handles decryption)
         return self.national_id_encrypted
@@ -391,7 +473,7 @@ class Rider(models.Model):
                 return full_id[:4] + '*' * stars_count + full_id[-4:]
             else:
                 return '***masked***'
-        except:
+        except TypeError:
             return '***masked***'
     
     def _authorize_id_access(self, accessed_by, reason):
@@ -413,12 +495,9 @@ class Rider(models.Model):
             return True
             
         # Enumerators can access IDs of their assigned riders
-        try:
-            enumerator = accessed_by.enumerator_profile
-            if self.assigned_enumerator == enumerator:
-                return True
-        except:
-            pass
+        enumerator = getattr(accessed_by, 'enumerator_profile', None)
+        if enumerator is not None and self.assigned_enumerator_id == enumerator.pk:
+            return True
             
         # User accessing their own ID
         rider_username = f"rider_{self.phone_number}"
@@ -437,20 +516,14 @@ class Rider(models.Model):
         Returns:
             bool: True if PIN was set successfully
         """
-        import bcrypt
         from django.utils import timezone
         
         # Validate PIN format (4-6 digits)
         if not pin_code or not pin_code.isdigit() or len(pin_code) < 4 or len(pin_code) > 6:
             raise ValueError("PIN must be 4-6 digits")
         
-        # Hash the PIN
-        pin_bytes = pin_code.encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed_pin = bcrypt.hashpw(pin_bytes, salt)
-        
         # Save to database
-        self.pin_hash = hashed_pin.decode('utf-8')
+        self.pin_hash = self._hash_pin(pin_code)
         self.pin_set_at = timezone.now()
         self.failed_pin_attempts = 0
         self.pin_locked_until = None
@@ -468,7 +541,6 @@ class Rider(models.Model):
         Returns:
             bool: True if PIN is correct
         """
-        import bcrypt
         from django.utils import timezone
         
         # Check if PIN is set
@@ -480,28 +552,64 @@ class Rider(models.Model):
             raise ValueError("PIN is temporarily locked due to too many failed attempts")
         
         # Verify PIN
-        pin_bytes = pin_code.encode('utf-8')
-        stored_hash = self.pin_hash.encode('utf-8')
+        if self.pin_hash.startswith(self.PIN_HASH_PREFIX):
+            salt_and_mac = base64.b64decode(self.pin_hash[len(self.PIN_HASH_PREFIX):])
+            pin_matches = hmac.compare_digest(
+                self._hash_pin(pin_code, salt_and_mac[:16]), self.pin_hash
+            )
+        else:
+            import bcrypt
+            pin_matches = bcrypt.checkpw(pin_code.encode('utf-8'), self.pin_hash.encode('utf-8'))
         
-        if bcrypt.checkpw(pin_bytes, stored_hash):
+        if pin_matches:
             # PIN correct - reset failed attempts and update last used
             self.failed_pin_attempts = 0
             self.pin_last_used = timezone.now()
             self.pin_locked_until = None
-            self.save(update_fields=['failed_pin_attempts', 'pin_last_used', 'pin_locked_until'])
+            updates = {
+                'failed_pin_attempts': 0,
+                'pin_last_used': self.pin_last_used,
+                'pin_locked_until': None,
+            }
+            
+            # Re-hash legacy bcrypt PINs now that we have the plain PIN, but only under a
+            # real pepper: HMAC with the development pepper is weaker than bcrypt
+            from django.conf import settings
+            if not self.pin_hash.startswith(self.PIN_HASH_PREFIX) and settings.PIN_REHASH_LEGACY:
+                self.pin_hash = self._hash_pin(pin_code)
+                updates['pin_hash'] = self.pin_hash
+            
+            Rider.objects.filter(pk=self.pk).update(**updates)
             return True
         else:
-            # PIN incorrect - increment failed attempts
-            self.failed_pin_attempts += 1
+            from datetime import timedelta
             
-            # Lock PIN after 5 failed attempts for 30 minutes
-            if self.failed_pin_attempts >= 5:
-                from datetime import timedelta
-                self.pin_locked_until = timezone.now() + timedelta(minutes=30)
+            # PIN incorrect - increment failed attempts and lock PIN for 30 minutes once
+            # MAX_PIN_ATTEMPTS is reached. Both are computed in the UPDATE so concurrent
+            # attempts cannot lose increments; When() sees the pre-increment value.
+            lock_until = timezone.now() + timedelta(minutes=30)
+            Rider.objects.filter(pk=self.pk).update(
+                failed_pin_attempts=models.F('failed_pin_attempts') + 1,
+                pin_locked_until=models.Case(
+                    models.When(failed_pin_attempts__gte=self.MAX_PIN_ATTEMPTS - 1, then=models.Value(lock_until)),
+                    default=models.F('pin_locked_until'),
+                ),
+            )
             
-            self.save(update_fields=['failed_pin_attempts', 'pin_locked_until'])
+            self.failed_pin_attempts += 1
+            if self.failed_pin_attempts >= self.MAX_PIN_ATTEMPTS:
+                self.pin_locked_until = lock_until
             return False
     
+    @classmethod
+    def _hash_pin(cls, pin_code, salt=None):
+        """Return the stored form of a PIN: prefix + base64(salt + HMAC-SHA256 digest)"""
+        from django.conf import settings
+        
+        salt = salt or secrets.token_bytes(16)
+        mac = hmac.new(settings.PIN_PEPPER.encode('utf-8'), salt + pin_code.encode('utf-8'), hashlib.sha256).digest()
+        return cls.PIN_HASH_PREFIX + base64.b64encode(salt + mac).decode('ascii')
+    
     def has_pin_set(self):
         """Check if rider has a PIN set"""
         return bool(self.pin_hash)
@@ -524,7 +632,7 @@ class Rider(models.Model):
         if not id_number:
             return False
             
-        encryptor = IDEncryption()
+        encryptor = get_id_encryptor()
         id_hash = encryptor.hash_id_for_verification(id_number)
         
         return Rider.objects.filter(
@@ -563,10 +671,15 @@ class RiderProgress(models.Model):
         unique_together = ['rider', 'lesson']
 
 
+def generate_reference_number():
+    """Random application reference: REF + 12 hex digits"""
+    return f"REF{secrets.token_hex(6).upper()}"
+
+
 class RiderApplication(models.Model):
     """Track rider applications for enumerator review"""
     rider = models.OneToOneField(Rider, on_delete=models.CASCADE, related_name='application')
-    reference_number = models.CharField(max_length=20, unique=True)
+    reference_number = models.CharField(max_length=20, unique=True, default=generate_reference_number)
     submitted_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(blank=True, null=True)
     reviewer_notes = models.TextField(blank=True)
@@ -575,21 +688,18 @@ class RiderApplication(models.Model):
     def __str__(self):
         return f"Application {self.reference_number} - {self.rider.full_name}"
 
-    def save(self, *args, **kwargs):
-        if not self.reference_number:
-            # Generate reference number: REF + timestamp
-            import time
-            self.reference_number = f"REF{int(time.time())}"
-        super().save(*args, **kwargs)
-
 
 # =============================================================================
 # DIGITAL LITERACY TRAINING MODELS
 # =============================================================================
 
+class DigitalLiteracyModuleManager(models.Manager):
+    def get_by_natural_key(self, title):
+        return self.get(title=title)
+
 class DigitalLiteracyModule(models.Model):
     """Digital literacy training modules"""
-    title = models.CharField(max_length=200)
+    title = models.CharField(max_length=200, unique=True)
     description = models.TextField()
     session_count = models.IntegerField(default=0)
     total_duration_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
@@ -597,13 +707,23 @@ class DigitalLiteracyModule(models.Model):
     icon = models.CharField(max_length=50, default='📱')  # Emoji icon for UI
     order = models.PositiveIntegerField()
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add so fixture loads (raw saves) without it still get a time
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    
+    objects = DigitalLiteracyModuleManager()
     
     class Meta:
         ordering = ['order']
     
     def __str__(self):
         return f"{self.title} ({self.session_count} sessions)"
+    
+    def natural_key(self):
+        return (self.title,)
+
+class TrainingSessionManager(models.Manager):
+    def get_by_natural_key(self, module_title, session_number):
+        return self.get(module__title=module_title, session_number=session_number)
 
 class TrainingSession(models.Model):
     """Individual sessions within a digital literacy module"""
@@ -616,12 +736,26 @@ class TrainingSession(models.Model):
     required_materials = models.JSONField(default=list)  # List of required materials/devices
     points_value = models.IntegerField()
     
+    objects = TrainingSessionManager()
+    
     class Meta:
         ordering = ['module', 'session_number']
         unique_together = ['module', 'session_number']
     
     def __str__(self):
         return f"{self.module.title} - Session {self.session_number}: {self.title}"
+    
+    def natural_key(self):
+        return self.module.natural_key() + (self.session_number,)
+    natural_key.dependencies = ['riders.digitalliteracymodule']
+
+class SessionScheduleQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate registered_attendees so registered_count/spots_remaining need no query per row"""
+        return self.annotate(registered_attendees=models.Count(
+            'attendance_records',
+            filter=models.Q(attendance_records__status__in=['REGISTERED', 'ATTENDED']),
+        ))
 
 class SessionSchedule(models.Model):
     """Scheduled training sessions with specific trainers, times, and locations"""
@@ -630,6 +764,9 @@ class SessionSchedule(models.Model):
     scheduled_date = models.DateTimeField()
     location_name = models.CharField(max_length=200)
     location_address = models.TextField()
+    stage = models.ForeignKey('Stage', on_delete=models.SET_NULL, null=True, blank=True,
+                              related_name='session_schedules',
+                              help_text="Stage where the session is held")
     gps_latitude = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
     gps_longitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
     capacity = models.IntegerField(default=20)
@@ -643,6 +780,8 @@ class SessionSchedule(models.Model):
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = SessionScheduleQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-scheduled_date']
     
@@ -652,6 +791,8 @@ class SessionSchedule(models.Model):
     @property
     def registered_count(self):
         """Get number of registered attendees"""
+        if hasattr(self, 'registered_attendees'):
+            return self.registered_attendees
         return self.attendance_records.filter(status__in=['REGISTERED', 'ATTENDED']).count()
     
     @property
@@ -659,6 +800,32 @@ class SessionSchedule(models.Model):
         """Get remaining capacity"""
         return max(0, self.capacity - self.registered_count)
 
+def distance_in_meters(lat1, lon1, lat2, lon2):
+    """
+    Distance in meters between two GPS points, or None if any coordinate is missing
+    
+    Check-ins are compared against a venue a few hundred meters away, so points
+    within ~1km use the equirectangular approximation (one cos, no inverse trig,
+    error far below GPS accuracy); anything further falls back to Haversine.
+    """
+    if not all([lat1, lon1, lat2, lon2]):
+        return None
+    
+    lat1, lon1, lat2, lon2 = float(lat1), float(lon1), float(lat2), float(lon2)
+    r = 6371000  # Radius of earth in meters
+    
+    if abs(lat2 - lat1) <= 0.01 and abs(lon2 - lon1) <= 0.01:
+        x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+        y = math.radians(lat2 - lat1)
+        return math.hypot(x, y) * r
+    
+    # Haversine formula
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    return 2 * math.asin(math.sqrt(a)) * r
+
 class SessionAttendance(models.Model):
     """Track attendance at physical training sessions"""
     schedule = models.ForeignKey(SessionSchedule, on_delete=models.CASCADE, related_name='attendance_records')
@@ -680,32 +847,18 @@ class SessionAttendance(models.Model):
     class Meta:
         unique_together = ['schedule', 'rider']
         ordering = ['-registration_time']
+        indexes = [
+            # registered_count / capacity checks count a schedule's rows by status
+            models.Index(fields=['schedule', 'status'], name='sessattend_sched_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.rider.full_name} - {self.schedule.session.title} ({self.status})"
     
     def calculate_distance_from_venue(self):
         """Calculate distance between check-in location and scheduled venue"""
-        if not all([self.check_in_gps_latitude, self.check_in_gps_longitude, 
-                   self.schedule.gps_latitude, self.schedule.gps_longitude]):
-            return None
-        
-        from math import radians, cos, sin, asin, sqrt
-        
-        # Convert to radians
-        lat1 = radians(float(self.check_in_gps_latitude))
-        lon1 = radians(float(self.check_in_gps_longitude))
-        lat2 = radians(float(self.schedule.gps_latitude))
-        lon2 = radians(float(self.schedule.gps_longitude))
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371  # Radius of earth in kilometers
-        
-        return c * r * 1000  # Return distance in meters
+        return distance_in_meters(self.check_in_gps_latitude, self.check_in_gps_longitude,
+                                  self.schedule.gps_latitude, self.schedule.gps_longitude)
 
 class AttendanceVerification(models.Model):
     """Dual verification system for attendance"""
@@ -751,14 +904,31 @@ class DigitalLiteracyProgress(models.Model):
     def __str__(self):
         return f"{self.rider.full_name} - {self.module.title} ({self.completion_percentage}%)"
     
-    def update_progress(self):
-        """Update completion percentage based on attended sessions"""
+    def update_progress(self, new_sessions=0):
+        """
+        Update completion percentage based on attended sessions
+        
+        The increment and percentage are computed in a single UPDATE so concurrent
+        attendance registrations cannot overwrite each other's counts.
+        
+        Args:
+            new_sessions (int): Sessions to add to sessions_attended first
+        """
         total_sessions = self.module.session_count
+        sessions_attended = models.F('sessions_attended') + new_sessions
+        updates = {
+            'sessions_attended': sessions_attended,
+            'last_session_attended': self.last_session_attended,
+        }
         if total_sessions > 0:
-            self.completion_percentage = (self.sessions_attended / total_sessions) * 100
-            if self.completion_percentage >= 100:
-                self.completed_at = timezone.now()
-        self.save()
+            # SET expressions see the pre-update row, hence the explicit new_sessions offset
+            updates['completion_percentage'] = sessions_attended * 100.0 / total_sessions
+            updates['completed_at'] = models.Case(
+                models.When(sessions_attended__gte=total_sessions - new_sessions, then=models.Value(timezone.now())),
+                default=models.F('completed_at'),
+            )
+        DigitalLiteracyProgress.objects.filter(pk=self.pk).update(**updates)
+        self.refresh_from_db(fields=['sessions_attended', 'completion_percentage', 'completed_at'])
 
 class PostSessionAssessment(models.Model):
     """Assessment after each training session"""
@@ -786,7 +956,7 @@ class PostSessionAssessment(models.Model):
         scores = [score for score in [self.practical_score, self.quiz_score] if score is not None]
         if scores:
             self.overall_score = sum(scores) / len(scores)
-            self.save()
+            self.save(update_fields=['overall_score'])
 
 class DigitalSkillsPoints(models.Model):
     """Enhanced points system for digital literacy training"""
@@ -815,6 +985,14 @@ class DigitalSkillsPoints(models.Model):
         return f"{self.rider.full_name} - {self.points} points ({self.source})"
 
 
+class StageQuerySet(models.QuerySet):
+    def with_active_counts(self):
+        """Annotate active_riders_count so get_active_riders_count needs no query per stage"""
+        return self.annotate(active_riders_count=models.Count(
+            'rider_assignments',
+            filter=models.Q(rider_assignments__status='ACTIVE'),
+        ))
+
 class Stage(models.Model):
     """Boda boda stages where riders operate and training sessions are held"""
     
@@ -829,6 +1007,9 @@ class Stage(models.Model):
         (MAINTENANCE, 'Under Maintenance'),
     ]
     
+    # Seconds an active stage lookup stays cached (see get_active)
+    CACHE_TIMEOUT = 300
+    
     # Basic Information
     stage_id = models.CharField(max_length=20, unique=True, help_text="Unique stage identifier (e.g., STAGE001)")
     name = models.CharField(max_length=100, help_text="Stage name")
@@ -858,6 +1039,8 @@ class Stage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = StageQuerySet.as_manager()
+    
     class Meta:
         ordering = ['stage_id']
         verbose_name = 'Boda Boda Stage'
@@ -868,19 +1051,40 @@ class Stage(models.Model):
     
     def get_active_riders_count(self):
         """Get count of active riders at this stage"""
-        return self.riders.filter(approval_status='approved').count()
+        if hasattr(self, 'active_riders_count'):
+            return self.active_riders_count
+        return self.rider_assignments.filter(status='ACTIVE').count()
     
     def get_training_sessions_count(self):
         """Get count of training sessions held at this stage"""
-        return SessionSchedule.objects.filter(
-            location_name__icontains=self.name
-        ).count()
+        return self.session_schedules.count()
+    
+    @classmethod
+    def get_active(cls, stage_id):
+        """
+        Get an active stage by stage_id, cached for CACHE_TIMEOUT seconds
+        
+        Misses are not cached so a newly added stage is usable at once.
+        Raises Stage.DoesNotExist like objects.get().
+        """
+        from django.core.cache import cache
+        
+        key = cls.cache_key(stage_id)
+        stage = cache.get(key)
+        if stage is None:
+            stage = cls.objects.get(stage_id=stage_id, status=cls.ACTIVE)
+            cache.set(key, stage, cls.CACHE_TIMEOUT)
+        return stage
+    
+    @staticmethod
+    def cache_key(stage_id):
+        return f'stage:{stage_id}'
     
     @classmethod
     def verify_stage_for_location(cls, stage_id, location_name=None):
         """Verify if a stage ID is valid for a given location"""
         try:
-            stage = cls.objects.get(stage_id=stage_id, status=cls.ACTIVE)
+            stage = cls.get_active(stage_id)
             
             # If location name is provided, check if it matches
             if location_name and location_name.lower() not in stage.name.lower():
@@ -906,6 +1110,9 @@ class StageRiderAssignment(models.Model):
     class Meta:
         unique_together = ['rider', 'stage']
         ordering = ['-is_primary', '-assigned_date']
+        indexes = [
+            models.Index(fields=['stage', 'status'], name='stageassign_stage_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.rider.full_name} at {self.stage.name}"
@@ -972,8 +1179,12 @@ class NotificationSchedule(models.Model):
     
     class Meta:
         ordering = ['scheduled_time']
+        # One reminder of each type per rider per session; NULL session_schedule rows are unconstrained
+        unique_together = ['rider', 'session_schedule', 'notification_type']
         indexes = [
-            models.Index(fields=['scheduled_time', 'status']),
+            # The sender only ever scans due pending rows, in send order
+            models.Index(fields=['scheduled_time'], name='notif_pending_time_idx',
+                         condition=models.Q(status='pending')),
             models.Index(fields=['rider', 'notification_type']),
         ]
     
@@ -984,80 +1195,81 @@ class NotificationSchedule(models.Model):
         """Mark notification as sent"""
         self.status = self.SENT
         self.sent_time = timezone.now()
-        self.save()
+        self.save(update_fields=['status', 'sent_time', 'updated_at'])
     
     def mark_as_failed(self, error_msg=""):
         """Mark notification as failed"""
         self.status = self.FAILED
         self.error_message = error_msg
         self.attempt_count += 1
-        self.save()
+        self.save(update_fields=['status', 'error_message', 'attempt_count', 'updated_at'])
     
     @classmethod
     def schedule_session_reminders(cls, session_schedule):
-        """Schedule all reminders for a training session"""
+        """
+        Schedule all reminders for a training session
+        
+        Returns:
+            int: Number of reminders actually inserted (already scheduled ones are skipped)
+        """
         from datetime import timedelta
         
-        # Get registered riders for this session
-        registered_riders = Rider.objects.filter(
-            sessionattendance__schedule=session_schedule,
-            sessionattendance__status__in=['registered', 'attended']
-        ).distinct()
+        # Get registered riders for this session; (schedule, rider) is unique so no DISTINCT
+        rider_ids = SessionAttendance.objects.filter(
+            schedule=session_schedule,
+            status__in=['REGISTERED', 'ATTENDED']
+        ).values_list('rider_id', flat=True)
         
-        reminders = []
+        now = timezone.now()
         session_start = session_schedule.scheduled_date
+        session_title = session_schedule.session.title
         
-        for rider in registered_riders:
+        # (type, title, message, send time, action) shared by every registered rider
+        reminder_specs = [
             # 1 day before reminder
-            day_before = session_start - timedelta(days=1)
-            if day_before > timezone.now():
-                reminders.append(cls(
-                    rider=rider,
-                    notification_type=cls.SESSION_REMINDER,
-                    title=f"Training Tomorrow: {session_schedule.session.title}",
-                    message=f"Don't forget your {session_schedule.session.title} session tomorrow at {session_start.strftime('%I:%M %p')} at {session_schedule.location_name}",
-                    scheduled_time=day_before,
-                    session_schedule=session_schedule,
-                    data={
-                        'session_id': session_schedule.id,
-                        'action': 'view_session'
-                    }
-                ))
-            
+            (cls.SESSION_REMINDER,
+             f"Training Tomorrow: {session_title}",
+             f"Don't forget your {session_title} session tomorrow at {session_start.strftime('%I:%M %p')} at {session_schedule.location_name}",
+             session_start - timedelta(days=1),
+             'view_session'),
             # 1 hour before reminder
-            hour_before = session_start - timedelta(hours=1)
-            if hour_before > timezone.now():
-                reminders.append(cls(
-                    rider=rider,
-                    notification_type=cls.SESSION_STARTING,
-                    title=f"Session Starting Soon!",
-                    message=f"Your {session_schedule.session.title} session starts in 1 hour. Make sure to arrive on time!",
-                    scheduled_time=hour_before,
-                    session_schedule=session_schedule,
-                    data={
-                        'session_id': session_schedule.id,
-                        'action': 'view_session'
-                    }
-                ))
-            
+            (cls.SESSION_STARTING,
+             f"Session Starting Soon!",
+             f"Your {session_title} session starts in 1 hour. Make sure to arrive on time!",
+             session_start - timedelta(hours=1),
+             'view_session'),
             # Attendance window opening (30 minutes before)
-            attendance_window = session_start - timedelta(minutes=30)
-            if attendance_window > timezone.now():
-                reminders.append(cls(
-                    rider=rider,
-                    notification_type=cls.ATTENDANCE_WINDOW,
-                    title="Attendance Registration Open",
-                    message=f"You can now register your attendance for {session_schedule.session.title}. Session starts in 30 minutes!",
-                    scheduled_time=attendance_window,
-                    session_schedule=session_schedule,
-                    data={
-                        'session_id': session_schedule.id,
-                        'action': 'register_attendance'
-                    }
-                ))
+            (cls.ATTENDANCE_WINDOW,
+             "Attendance Registration Open",
+             f"You can now register your attendance for {session_title}. Session starts in 30 minutes!",
+             session_start - timedelta(minutes=30),
+             'register_attendance'),
+        ]
+        reminder_specs = [spec for spec in reminder_specs if spec[3] > now]
+        
+        reminders = [
+            cls(
+                rider_id=rider_id,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                scheduled_time=scheduled_time,
+                session_schedule=session_schedule,
+                data={
+                    'session_id': session_schedule.id,
+                    'action': action
+                }
+            )
+            for rider_id in (rider_ids if reminder_specs else [])
+            for notification_type, title, message, scheduled_time, action in reminder_specs
+        ]
         
-        # Bulk create all reminders
-        if reminders:
-            cls.objects.bulk_create(reminders)
+        if not reminders:
+            return 0
         
-        return len(reminders)
\ No newline at end of file
+        # Bulk create all reminders; reminders already scheduled for a rider are skipped.
+        # ignore_conflicts leaves no trace of what was skipped, so count the rows instead.
+        scheduled = cls.objects.filter(session_schedule=session_schedule)
+        existing_count = scheduled.count()
+        cls.objects.bulk_create(reminders, batch_size=500, ignore_conflicts=True)
+        return scheduled.count() - existing_count
\ No newline at end of file
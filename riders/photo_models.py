@@ -21,6 +21,10 @@ class PhotoVerificationResult(models.Model):
         ('FLAGGED', 'Flagged for Review'),
     ]
     
+    # photo_verification_statistics payload; dropped whenever a result is saved
+    STATS_CACHE_KEY = 'photo_verification_stats'
+    STATS_CACHE_TIMEOUT = 30
+    
     # Relationships
     rider = models.ForeignKey('Rider', on_delete=models.CASCADE, related_name='photo_verifications')
     verified_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
@@ -34,6 +38,12 @@ class PhotoVerificationResult(models.Model):
     confidence_score = models.FloatField(null=True, help_text="Confidence score (0-1)")
     face_match_score = models.FloatField(null=True, help_text="Face matching confidence (0-1)")
     
+    # SHA-256 of the photo files that were verified, and the rider's national_id_hash at the
+    # time; a VERIFIED result is reused only while all three are unchanged
+    profile_photo_sha256 = models.CharField(max_length=64, blank=True)
+    id_photo_sha256 = models.CharField(max_length=64, blank=True)
+    national_id_hash = models.CharField(max_length=64, blank=True)
+    
     # Detailed results (JSON)
     verification_details = models.JSONField(default=dict, help_text="Detailed verification results")
     warnings = models.JSONField(default=list, help_text="Verification warnings")
@@ -52,6 +62,11 @@ class PhotoVerificationResult(models.Model):
         indexes = [
             models.Index(fields=['rider', 'verification_status']),
             models.Index(fields=['verification_status', '-created_at']),
+            models.Index(
+                fields=['-verified_at'],
+                name='photoverif_verified_at_idx',
+                condition=models.Q(verified_at__isnull=False),
+            ),
         ]
     
     def __str__(self):
@@ -63,9 +78,11 @@ def add_photo_verification_methods():
     """Add photo verification methods to the existing Rider model"""
     
     from .models import Rider
-    from .services.photo_verification import PhotoVerificationService
+    from .services.photo_verification import file_sha256, get_photo_verifier
+    from concurrent.futures import ThreadPoolExecutor
     from django.utils import timezone
     import logging
+    import operator
     
     logger = logging.getLogger('photo_verification')
     
@@ -78,6 +95,10 @@ def add_photo_verification_methods():
             
         Returns:
             dict: Verification results
+            
+        Raises:
+            OSError: Photo storage or OCR I/O failed; these are transient, so they are
+                left to the caller (verify_rider_photos_task retries them)
         """
         if not self.profile_photo or not self.national_id_photo:
             return {
@@ -86,31 +107,50 @@ def add_photo_verification_methods():
             }
         
         try:
-            verifier = PhotoVerificationService()
+            verifier = get_photo_verifier()
             results = {}
+            profile_path = self.profile_photo.path
+            id_path = self.national_id_photo.path
+            profile_sha256 = file_sha256(profile_path)
+            id_sha256 = file_sha256(id_path)
             
-            # 1. Verify profile photo authenticity
-            logger.info(f"Verifying profile photo for rider {self.id}")
-            profile_result = verifier.verify_photo_authenticity(self.profile_photo.path)
-            results['profile_photo'] = profile_result
+            national_id_hash = self.national_id_hash or ''
             
-            # 2. Verify ID document authenticity  
-            logger.info(f"Verifying ID document for rider {self.id}")
-            id_result = verifier.verify_photo_authenticity(self.national_id_photo.path)
-            results['id_document'] = id_result
+            # 0. Photos and national ID unchanged since a VERIFIED result: return it without
+            # re-running the checks (the ID cross-check depends on the national ID too)
+            previous = PhotoVerificationResult.objects.filter(
+                rider=self,
+                photo_type='PROFILE',
+                verification_status='VERIFIED',
+                profile_photo_sha256=profile_sha256,
+                id_photo_sha256=id_sha256,
+                national_id_hash=national_id_hash
+            ).only('verification_status', 'verification_details').first()
+            if previous:
+                logger.info(f"Photos and national ID unchanged for rider {self.id}, reusing VERIFIED result")
+                results = previous.verification_details
+                return {
+                    'success': True,
+                    'overall_score': self._calculate_photo_verification_score(results),
+                    'status': previous.verification_status,
+                    'results': results,
+                    'summary': self._photo_verification_summary(results)
+                }
             
-            # 3. Compare faces between photos
-            logger.info(f"Comparing faces for rider {self.id}")
-            face_comparison = verifier.compare_faces(
-                self.profile_photo.path, 
-                self.national_id_photo.path
-            )
-            results['face_match'] = face_comparison
+            # 1-4. Authenticity of both photos, face comparison and ID extraction are
+            # independent and spend their time in Pillow/OpenCV/dlib/Tesseract, which
+            # release the GIL, so run them concurrently
+            logger.info(f"Verifying photos, comparing faces and extracting ID information for rider {self.id}")
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                profile_future = executor.submit(verifier.verify_photo_authenticity, profile_path)
+                id_future = executor.submit(verifier.verify_photo_authenticity, id_path)
+                face_future = executor.submit(verifier.compare_faces, profile_path, id_path)
+                extraction_future = executor.submit(verifier.extract_id_information, id_path)
             
-            # 4. Extract information from ID document
-            logger.info(f"Extracting ID information for rider {self.id}")
-            id_extraction = verifier.extract_id_information(self.national_id_photo.path)
-            results['id_extraction'] = id_extraction
+            profile_result = results['profile_photo'] = profile_future.result()
+            results['id_document'] = id_future.result()
+            face_comparison = results['face_match'] = face_future.result()
+            id_extraction = results['id_extraction'] = extraction_future.result()
             
             # 5. Cross-verify extracted ID with provided ID (if available)
             results['id_cross_verification'] = None
@@ -166,6 +206,9 @@ def add_photo_verification_methods():
                     'is_authentic': profile_result.get('authentic', False),
                     'confidence_score': profile_result.get('confidence', 0),
                     'face_match_score': face_comparison.get('confidence', 0),
+                    'profile_photo_sha256': profile_sha256,
+                    'id_photo_sha256': id_sha256,
+                    'national_id_hash': national_id_hash,
                     'verification_details': results,
                     'warnings': profile_result.get('warnings', []),
                     'verified_by': verified_by,
@@ -180,15 +223,11 @@ def add_photo_verification_methods():
                 'overall_score': overall_score,
                 'status': verification_status,
                 'results': results,
-                'summary': {
-                    'profile_authentic': profile_result.get('authentic', False),
-                    'id_authentic': id_result.get('authentic', False),
-                    'faces_match': face_comparison.get('match', False),
-                    'id_extracted': id_extraction.get('success', False),
-                    'cross_verified': results['id_cross_verification'].get('match', False) if results['id_cross_verification'] else None
-                }
+                'summary': self._photo_verification_summary(results)
             }
             
+        except OSError:
+            raise
         except Exception as e:
             logger.error(f"Photo verification failed for rider {self.id}: {e}")
             return {
@@ -196,6 +235,16 @@ def add_photo_verification_methods():
                 'error': str(e)
             }
     
+    def _photo_verification_summary(self, results):
+        """Summarize verify_photos results"""
+        return {
+            'profile_authentic': results['profile_photo'].get('authentic', False),
+            'id_authentic': results['id_document'].get('authentic', False),
+            'faces_match': results['face_match'].get('match', False),
+            'id_extracted': results['id_extraction'].get('success', False),
+            'cross_verified': results['id_cross_verification'].get('match', False) if results['id_cross_verification'] else None
+        }
+    
     def _calculate_photo_verification_score(self, results):
         """Calculate overall photo verification score"""
         score = 0.0
@@ -228,8 +277,8 @@ def add_photo_verification_methods():
         if not id1 or not id2:
             return 0.0
         
-        # Simple character-by-character comparison
-        matches = sum(c1 == c2 for c1, c2 in zip(id1, id2))
+        # Character-by-character comparison; map(operator.eq) keeps the loop in C
+        matches = sum(map(operator.eq, id1, id2))
         max_length = max(len(id1), len(id2))
         
         return matches / max_length if max_length > 0 else 0.0
@@ -259,6 +308,7 @@ def add_photo_verification_methods():
     # Add methods to Rider class
     Rider.verify_photos = verify_photos
     Rider._calculate_photo_verification_score = _calculate_photo_verification_score
+    Rider._photo_verification_summary = _photo_verification_summary
     Rider._calculate_id_similarity = _calculate_id_similarity
     Rider.get_photo_verification_report = get_photo_verification_report
 
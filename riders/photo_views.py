@@ -7,9 +7,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 from .models import Rider, Enumerator
 from .photo_models import PhotoVerificationResult
+from .tasks import verify_rider_photos_task
 import logging
 
 logger = logging.getLogger('photo_verification')
@@ -18,9 +20,10 @@ logger = logging.getLogger('photo_verification')
 @permission_classes([IsAuthenticated])
 def verify_rider_photos(request, rider_id):
     """
-    Run comprehensive photo verification for a rider
+    Queue comprehensive photo verification for a rider
     
     POST /api/riders/{rider_id}/verify-photos/
+    Poll GET /api/riders/verify-photos/{job_id}/status/ for the result
     """
     try:
         rider = Rider.objects.get(pk=rider_id)
@@ -41,48 +44,16 @@ def verify_rider_photos(request, rider_id):
                 }
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Run verification
-        logger.info(f"Starting photo verification for rider {rider_id} by user {request.user.id}")
-        result = rider.verify_photos(verified_by=request.user)
+        # Queue verification; OCR and face matching take seconds, so they run on a worker
+        job = verify_rider_photos_task.delay(rider.id, request.user.id)
+        logger.info(f"Queued photo verification for rider {rider_id} by user {request.user.id} (job {job.id})")
         
-        if result['success']:
-            # Send notification to rider about verification result
-            # send_photo_verification_notification.delay(rider.id, result['status'])
-            
-            return Response({
-                'success': True,
-                'message': 'Photo verification completed',
-                'rider_id': rider.id,
-                'status': result['status'],
-                'overall_score': result['overall_score'],
-                'summary': result['summary'],
-                'details': {
-                    'profile_photo': {
-                        'authentic': result['results']['profile_photo'].get('authentic'),
-                        'confidence': result['results']['profile_photo'].get('confidence'),
-                        'warnings': result['results']['profile_photo'].get('warnings', [])
-                    },
-                    'id_document': {
-                        'authentic': result['results']['id_document'].get('authentic'),
-                        'confidence': result['results']['id_document'].get('confidence'),
-                        'warnings': result['results']['id_document'].get('warnings', [])
-                    },
-                    'face_match': {
-                        'match': result['results']['face_match'].get('match'),
-                        'confidence': result['results']['face_match'].get('confidence'),
-                        'error': result['results']['face_match'].get('error')
-                    },
-                    'id_extraction': {
-                        'success': result['results']['id_extraction'].get('success'),
-                        'extracted_info': result['results']['id_extraction'].get('parsed_info', {})
-                    }
-                }
-            })
-        else:
-            return Response({
-                'success': False,
-                'error': result['error']
-            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'success': True,
+            'message': 'Photo verification queued',
+            'rider_id': rider.id,
+            'job_id': job.id
+        }, status=status.HTTP_202_ACCEPTED)
             
     except Rider.DoesNotExist:
         return Response({
@@ -96,6 +67,77 @@ def verify_rider_photos(request, rider_id):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def photo_verification_job_status(request, job_id):
+    """
+    Get the state of a queued photo verification
+    
+    GET /api/riders/verify-photos/{job_id}/status/
+    """
+    if not (request.user.is_staff or hasattr(request.user, 'enumerator_profile')):
+        return Response({
+            'error': 'Only enumerators and admins can verify photos'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    job = verify_rider_photos_task.AsyncResult(job_id)
+    
+    if not job.ready():
+        return Response({
+            'job_id': job_id,
+            'state': job.state
+        })
+    
+    if job.failed():
+        logger.error(f"Photo verification job {job_id} failed: {job.result}")
+        return Response({
+            'job_id': job_id,
+            'state': job.state,
+            'error': 'Photo verification failed'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    result = job.result
+    if not result.get('success'):
+        return Response({
+            'job_id': job_id,
+            'state': job.state,
+            'success': False,
+            'error': result.get('error')
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'job_id': job_id,
+        'state': job.state,
+        'success': True,
+        'message': 'Photo verification completed',
+        'rider_id': result['rider_id'],
+        'status': result['status'],
+        'overall_score': result['overall_score'],
+        'summary': result['summary'],
+        'details': {
+            'profile_photo': {
+                'authentic': result['results']['profile_photo'].get('authentic'),
+                'confidence': result['results']['profile_photo'].get('confidence'),
+                'warnings': result['results']['profile_photo'].get('warnings', [])
+            },
+            'id_document': {
+                'authentic': result['results']['id_document'].get('authentic'),
+                'confidence': result['results']['id_document'].get('confidence'),
+                'warnings': result['results']['id_document'].get('warnings', [])
+            },
+            'face_match': {
+                'match': result['results']['face_match'].get('match'),
+                'confidence': result['results']['face_match'].get('confidence'),
+                'error': result['results']['face_match'].get('error')
+            },
+            'id_extraction': {
+                'success': result['results']['id_extraction'].get('success'),
+                'extracted_info': result['results']['id_extraction'].get('parsed_info', {})
+            }
+        }
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_photo_verification_report(request, rider_id):
@@ -228,23 +270,23 @@ def get_riders_pending_photo_verification(request):
                 'error': 'Only enumerators and admins can view pending verifications'
             }, status=status.HTTP_403_FORBIDDEN)
         
+        # Join the enumerator and load only the columns serialized below
+        riders = Rider.objects.filter(
+            photo_verification_status__in=['PENDING', 'FLAGGED'],
+            profile_photo__isnull=False,
+            national_id_photo__isnull=False
+        ).select_related('assigned_enumerator').only(
+            'id', 'first_name', 'last_name', 'phone_number', 'unique_id',
+            'photo_verification_status', 'face_match_score', 'status', 'created_at',
+            'profile_photo', 'national_id_photo',
+            'assigned_enumerator__id', 'assigned_enumerator__unique_id',
+            'assigned_enumerator__first_name', 'assigned_enumerator__last_name'
+        )
+        
         # Filter based on user type
         if hasattr(request.user, 'enumerator_profile'):
             # Enumerator sees only their assigned riders
-            enumerator = request.user.enumerator_profile
-            riders = Rider.objects.filter(
-                assigned_enumerator=enumerator,
-                photo_verification_status__in=['PENDING', 'FLAGGED'],
-                profile_photo__isnull=False,
-                national_id_photo__isnull=False
-            )
-        else:
-            # Admin sees all pending
-            riders = Rider.objects.filter(
-                photo_verification_status__in=['PENDING', 'FLAGGED'],
-                profile_photo__isnull=False,
-                national_id_photo__isnull=False
-            )
+            riders = riders.filter(assigned_enumerator=request.user.enumerator_profile)
         
         riders_data = []
         for rider in riders:
@@ -295,56 +337,72 @@ def photo_verification_statistics(request):
                 'error': 'Admin access required'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        from django.db.models import Count, Avg
-        
-        # Overall statistics
-        total_riders = Rider.objects.count()
-        riders_with_photos = Rider.objects.filter(
-            profile_photo__isnull=False,
-            national_id_photo__isnull=False
-        ).count()
-        
-        # Verification status breakdown
-        status_breakdown = Rider.objects.values('photo_verification_status').annotate(
-            count=Count('id')
-        )
-        
-        # Average face match scores
-        avg_face_match = Rider.objects.filter(
-            face_match_score__isnull=False
-        ).aggregate(Avg('face_match_score'))
+        payload = cache.get(PhotoVerificationResult.STATS_CACHE_KEY)
+        if payload is None:
+            payload = _photo_verification_statistics()
+            cache.set(PhotoVerificationResult.STATS_CACHE_KEY, payload, PhotoVerificationResult.STATS_CACHE_TIMEOUT)
         
-        # Recent verification results
-        recent_verifications = PhotoVerificationResult.objects.filter(
-            verified_at__isnull=False
-        ).order_by('-verified_at')[:10]
-        
-        recent_data = []
-        for verification in recent_verifications:
-            recent_data.append({
-                'rider_name': verification.rider.full_name,
-                'status': verification.verification_status,
-                'confidence_score': verification.confidence_score,
-                'verified_at': verification.verified_at.isoformat(),
-                'verified_by': verification.verified_by.username if verification.verified_by else None
-            })
-        
-        return Response({
-            'overview': {
-                'total_riders': total_riders,
-                'riders_with_photos': riders_with_photos,
-                'photo_coverage_percentage': round((riders_with_photos / total_riders * 100), 2) if total_riders > 0 else 0
-            },
-            'verification_status': {item['photo_verification_status']: item['count'] for item in status_breakdown},
-            'performance': {
-                'average_face_match_score': round(avg_face_match['face_match_score__avg'] or 0, 3)
-            },
-            'recent_verifications': recent_data
-        })
+        return Response(payload)
         
     except Exception as e:
         logger.error(f"Error generating photo verification statistics: {e}")
         return Response({
             'error': 'Failed to generate statistics',
             'details': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _photo_verification_statistics():
+    """Build the photo_verification_statistics payload"""
+    from django.db.models import Count, Avg, Q
+    
+    # Overall statistics, status breakdown and average face match score in one scan
+    verification_statuses = ['PENDING', 'VERIFIED', 'REJECTED', 'FLAGGED']
+    stats = Rider.objects.aggregate(
+        total_riders=Count('id'),
+        riders_with_photos=Count('id', filter=Q(
+            profile_photo__isnull=False,
+            national_id_photo__isnull=False
+        )),
+        avg_face_match=Avg('face_match_score'),
+        **{
+            verification_status: Count('id', filter=Q(photo_verification_status=verification_status))
+            for verification_status in verification_statuses
+        }
+    )
+    total_riders = stats['total_riders']
+    riders_with_photos = stats['riders_with_photos']
+    
+    # Recent verification results
+    recent_verifications = PhotoVerificationResult.objects.filter(
+        verified_at__isnull=False
+    ).select_related('rider', 'verified_by').only(
+        'verification_status', 'confidence_score', 'verified_at',
+        'rider__first_name', 'rider__last_name', 'verified_by__username'
+    ).order_by('-verified_at')[:10]
+    
+    recent_data = []
+    for verification in recent_verifications:
+        recent_data.append({
+            'rider_name': verification.rider.full_name,
+            'status': verification.verification_status,
+            'confidence_score': verification.confidence_score,
+            'verified_at': verification.verified_at.isoformat(),
+            'verified_by': verification.verified_by.username if verification.verified_by else None
+        })
+    
+    return {
+        'overview': {
+            'total_riders': total_riders,
+            'riders_with_photos': riders_with_photos,
+            'photo_coverage_percentage': round((riders_with_photos / total_riders * 100), 2) if total_riders > 0 else 0
+        },
+        'verification_status': {
+            verification_status: stats[verification_status]
+            for verification_status in verification_statuses
+        },
+        'performance': {
+            'average_face_match_score': round(stats['avg_face_match'] or 0, 3)
+        },
+        'recent_verifications': recent_data
+    }
@@ -4,9 +4,11 @@ Handles photo authenticity, face matching, and ID document verification
 """
 
 import logging
+import functools
 import hashlib
 import numpy as np
 from PIL import Image, ImageFilter, ImageStat, ExifTags
+from django.core.cache import caches
 from django.core.files.storage import default_storage
 from django.conf import settings
 import io
@@ -127,13 +129,9 @@ class PhotoVerificationService:
             # Try to import face_recognition
             import face_recognition
             
-            # Load images
-            profile_image = face_recognition.load_image_file(profile_photo_path)
-            id_image = face_recognition.load_image_file(id_photo_path)
-            
-            # Find faces
-            profile_encodings = face_recognition.face_encodings(profile_image)
-            id_encodings = face_recognition.face_encodings(id_image)
+            # Find faces (encodings are cached by file content)
+            profile_encodings = self._face_encodings(face_recognition, profile_photo_path)
+            id_encodings = self._face_encodings(face_recognition, id_photo_path)
             
             if not profile_encodings:
                 return {
@@ -186,6 +184,22 @@ class PhotoVerificationService:
                 'error': str(e)
             }
     
+    def _face_encodings(self, face_recognition, image_path):
+        """
+        Face encodings for an image, cached by the SHA-256 of its contents
+        
+        Re-verifying the same photo skips the face detection and embedding step. The
+        'face_encodings' cache is Redis, so entries are shared by all workers.
+        """
+        face_cache = caches['face_encodings']
+        key = file_sha256(image_path)
+        encodings = face_cache.get(key)
+        if encodings is None:
+            image = face_recognition.load_image_file(image_path)
+            encodings = face_recognition.face_encodings(image)
+            face_cache.set(key, encodings)
+        return encodings
+    
     def extract_id_information(self, id_photo_path):
         """
         Extract text information from ID document using OCR
@@ -565,4 +579,33 @@ class PhotoVerificationService:
                 score += weight if passed else 0
                 total_weight += weight
         
-        return score / total_weight if total_weight > 0 else 0.0
\ No newline at end of file
+        return score / total_weight if total_weight > 0 else 0.0
+
+
+def file_sha256(path, chunk_size=64 * 1024):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.cache
+def get_photo_verifier():
+    """Return the shared PhotoVerificationService instance (it keeps no per-call state)"""
+    return PhotoVerificationService()
+
+
+def preload_photo_verification_libraries():
+    """
+    Import the optional face matching, OCR and OpenCV libraries up front
+
+    They are imported lazily by PhotoVerificationService; face_recognition loads its
+    dlib models on import, so warming them in a worker spares the first verification.
+    """
+    for module_name in ('face_recognition', 'pytesseract', 'cv2'):
+        try:
+            __import__(module_name)
+        except ImportError:
+            logger.info(f"{module_name} not available for photo verification")
@@ -0,0 +1,29 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DigitalLiteracyModule, Stage, TrainingSession
+from .photo_models import PhotoVerificationResult
+
+
+@receiver(post_save, sender=TrainingSession)
+@receiver(post_delete, sender=TrainingSession)
+def update_module_session_count(sender, instance, **kwargs):
+    """Keep DigitalLiteracyModule.session_count in step with its sessions"""
+    DigitalLiteracyModule.objects.filter(pk=instance.module_id).update(
+        session_count=TrainingSession.objects.filter(module_id=instance.module_id).count()
+    )
+
+
+@receiver(post_save, sender=Stage)
+@receiver(post_delete, sender=Stage)
+def clear_cached_stage(sender, instance, **kwargs):
+    """Drop the cached Stage.get_active lookup when a stage changes"""
+    cache.delete(Stage.cache_key(instance.stage_id))
+
+
+@receiver(post_save, sender=PhotoVerificationResult)
+@receiver(post_delete, sender=PhotoVerificationResult)
+def clear_cached_photo_stats(sender, **kwargs):
+    """Drop the cached photo verification statistics when a result changes"""
+    cache.delete(PhotoVerificationResult.STATS_CACHE_KEY)
@@ -0,0 +1,51 @@
+"""
+Celery tasks for the riders app
+"""
+
+from celery import shared_task
+from celery.signals import worker_process_init
+from django.contrib.auth.models import User
+from .models import Rider
+from .services.photo_verification import get_photo_verifier, preload_photo_verification_libraries
+import logging
+
+logger = logging.getLogger('photo_verification')
+
+
+@worker_process_init.connect
+def warm_photo_verifier(**kwargs):
+    """Load the photo verification service and its libraries once per worker process"""
+    get_photo_verifier()
+    preload_photo_verification_libraries()
+
+
+# Only storage/OCR I/O errors escape verify_photos; a missing photo file will not reappear
+@shared_task(
+    bind=True,
+    autoretry_for=(OSError,),
+    dont_autoretry_for=(FileNotFoundError,),
+    retry_backoff=True,
+    max_retries=3
+)
+def verify_rider_photos_task(self, rider_id, user_id=None):
+    """
+    Run photo verification for a rider outside the request cycle
+
+    Args:
+        rider_id (int): Rider to verify
+        user_id (int): User who requested the verification
+
+    Returns:
+        dict: Result of Rider.verify_photos(), plus rider_id
+    """
+    try:
+        rider = Rider.objects.get(pk=rider_id)
+    except Rider.DoesNotExist:
+        return {'success': False, 'rider_id': rider_id, 'error': 'Rider not found'}
+
+    verified_by = User.objects.filter(pk=user_id).first() if user_id else None
+
+    logger.info(f"Starting photo verification for rider {rider_id} (job {self.request.id})")
+    result = rider.verify_photos(verified_by=verified_by)
+    result['rider_id'] = rider_id
+    return result
@@ -1,3 +1,213 @@
-from django.test import TestCase
+import base64
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    DigitalLiteracyModule, Enumerator, NotificationSchedule, Rider, SessionAttendance,
+    SessionSchedule, TrainingSession, UniqueIDSequence,
+)
+from .tasks import verify_rider_photos_task
+
+# API throttling and the photo caches use Redis in settings; keep tests self-contained
+LOCMEM_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+    for alias in ('default', 'face_encodings')
+}
+
+
+def create_enumerator(username='trainer', phone_number='+256700000001', password='trainer-pass'):
+    return Enumerator.objects.create(
+        user=User.objects.create_user(username, password=password),
+        first_name='Test',
+        last_name='Trainer',
+        phone_number=phone_number,
+        location='Kampala',
+        assigned_region='Central',
+    )
+
+
+class ScheduleSessionRemindersTests(TestCase):
+    """NotificationSchedule.schedule_session_reminders"""
+
+    @classmethod
+    def setUpTestData(cls):
+        trainer = create_enumerator()
+        module = DigitalLiteracyModule.objects.create(
+            title='Smartphone Basics', description='Basics', points_value=50, order=1
+        )
+        session = TrainingSession.objects.create(
+            module=module, session_number=1, title='Getting Started', description='Intro',
+            duration_hours=2, points_value=10
+        )
+        cls.schedule = SessionSchedule.objects.create(
+            session=session,
+            trainer=trainer,
+            scheduled_date=timezone.now() + timedelta(days=3),
+            location_name='Kampala Stage',
+            location_address='Kampala Road',
+        )
+        for phone in ('+256700000101', '+256700000102'):
+            SessionAttendance.objects.create(
+                schedule=cls.schedule, rider=Rider.objects.create(phone_number=phone)
+            )
+
+    def test_counts_inserted_reminders(self):
+        # Three reminders (day before, hour before, attendance window) per registered rider
+        self.assertEqual(NotificationSchedule.schedule_session_reminders(self.schedule), 6)
+        self.assertEqual(NotificationSchedule.objects.filter(session_schedule=self.schedule).count(), 6)
+
+    def test_second_call_inserts_nothing(self):
+        NotificationSchedule.schedule_session_reminders(self.schedule)
+
+        self.assertEqual(NotificationSchedule.schedule_session_reminders(self.schedule), 0)
+        self.assertEqual(NotificationSchedule.objects.filter(session_schedule=self.schedule).count(), 6)
+
+    def test_new_rider_only_gets_missing_reminders(self):
+        NotificationSchedule.schedule_session_reminders(self.schedule)
+        SessionAttendance.objects.create(
+            schedule=self.schedule, rider=Rider.objects.create(phone_number='+256700000103')
+        )
+
+        self.assertEqual(NotificationSchedule.schedule_session_reminders(self.schedule), 3)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class UniqueIDSequenceTests(TestCase):
+    """EN-/DB- profile ID allocation"""
+
+    def setUp(self):
+        self.year = timezone.now().year
+
+    def test_new_counter_seeds_from_highest_issued_id(self):
+        # 10000 sorts before 9999 as a string; the counter must still continue after it
+        for number in ('0007', '9999', '10000'):
+            Rider.objects.create(phone_number=f'+25670{number}', unique_id=f'DB-{self.year}-{number}')
+        Rider.objects.create(phone_number='+256711111111', unique_id=f'DB-{self.year - 1}-20000')
+
+        self.assertEqual(UniqueIDSequence.next_id('DB', self.year, Rider), f'DB-{self.year}-10001')
+
+    def test_allocates_sequentially_within_a_year(self):
+        rider = Rider.objects.create(phone_number='+256700000201')
+        allocated = []
+        for _ in range(3):
+            rider.generate_unique_id()
+            allocated.append(rider.unique_id)
+
+        self.assertEqual(allocated, [f'DB-{self.year}-0001', f'DB-{self.year}-0002', f'DB-{self.year}-0003'])
+        self.assertEqual(UniqueIDSequence.objects.get(prefix='DB', year=self.year).last_number, 3)
+
+    def test_new_year_starts_a_new_counter(self):
+        first = create_enumerator('first', '+256700000301')
+        next_year = datetime(self.year + 1, 1, 1, tzinfo=timezone.get_current_timezone())
+        with mock.patch('django.utils.timezone.now', return_value=next_year):
+            second = create_enumerator('second', '+256700000302')
+        third = create_enumerator('third', '+256700000303')
+
+        self.assertEqual(first.unique_id, f'EN-{self.year}-0001')
+        self.assertEqual(second.unique_id, f'EN-{self.year + 1}-0001')
+        self.assertEqual(third.unique_id, f'EN-{self.year}-0002')
+
+    def test_enumerator_id_is_saved_on_create(self):
+        enumerator = create_enumerator()
+
+        enumerator.refresh_from_db()
+        self.assertEqual(enumerator.unique_id, f'EN-{self.year}-0001')
+
+    def test_approved_rider_id_is_persisted(self):
+        # The enumerator signs in with its EN- ID, so both IDs must be in the database
+        enumerator = create_enumerator()
+        rider = Rider.objects.create(
+            phone_number='+256700000401', assigned_enumerator=enumerator, status=Rider.PENDING_APPROVAL
+        )
+        credentials = base64.b64encode(f'{enumerator.unique_id}:trainer-pass'.encode()).decode()
+
+        response = self.client.post(
+            reverse('enumerator_approve_rider', args=[rider.id]),
+            HTTP_AUTHORIZATION=f'Basic {credentials}',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        rider.refresh_from_db()
+        self.assertEqual(rider.status, Rider.APPROVED)
+        self.assertEqual(rider.unique_id, f'DB-{self.year}-0001')
+        self.assertEqual(response.json()['rider']['uniqueId'], rider.unique_id)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, CELERY_TASK_ALWAYS_EAGER=True)
+class PhotoVerificationJobTests(TestCase):
+    """Queued photo verification: verify_rider_photos_task and its status endpoint"""
+
+    FAILED_RESULT = {'success': False, 'error': 'No face found in profile photo'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('admin', password='admin-pass', is_staff=True)
+        cls.rider = Rider.objects.create(
+            phone_number='+256700000501',
+            profile_photo='profiles/rider.jpg',
+            national_id_photo='documents/rider_id.jpg',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def job_status(self, job):
+        with mock.patch.object(verify_rider_photos_task, 'AsyncResult', return_value=job):
+            return self.client.get(reverse('photo_verification_job_status', args=['job-1']))
+
+    def test_verify_queues_job_and_returns_202(self):
+        with mock.patch.object(Rider, 'verify_photos', return_value=self.FAILED_RESULT) as verify_photos:
+            response = self.client.post(reverse('verify_rider_photos', args=[self.rider.id]))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()['job_id'])
+        self.assertEqual(response.json()['rider_id'], self.rider.id)
+        verify_photos.assert_called_once_with(verified_by=self.staff)
+
+    def test_status_of_pending_job(self):
+        response = self.job_status(mock.Mock(state='PENDING', ready=mock.Mock(return_value=False)))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'job_id': 'job-1', 'state': 'PENDING'})
+
+    def test_status_of_failed_job_is_500(self):
+        response = self.job_status(mock.Mock(
+            state='FAILURE',
+            result=OSError('storage down'),
+            ready=mock.Mock(return_value=True),
+            failed=mock.Mock(return_value=True),
+        ))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()['state'], 'FAILURE')
+
+    def test_status_of_unsuccessful_verification_is_400(self):
+        response = self.job_status(mock.Mock(
+            state='SUCCESS',
+            result={**self.FAILED_RESULT, 'rider_id': self.rider.id},
+            ready=mock.Mock(return_value=True),
+            failed=mock.Mock(return_value=False),
+        ))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['success'], False)
+        self.assertEqual(response.json()['error'], self.FAILED_RESULT['error'])
+
+    def test_transient_io_error_is_retried(self):
+        with mock.patch.object(Rider, 'verify_photos', side_effect=OSError('storage down')) as verify_photos:
+            job = verify_rider_photos_task.apply(args=(self.rider.id,))
+
+        self.assertEqual(job.state, 'FAILURE')
+        self.assertEqual(verify_photos.call_count, verify_rider_photos_task.max_retries + 1)
+
+    def test_missing_photo_file_is_not_retried(self):
+        with mock.patch.object(Rider, 'verify_photos', side_effect=FileNotFoundError('gone')) as verify_photos:
+            job = verify_rider_photos_task.apply(args=(self.rider.id,))
+
+        self.assertEqual(job.state, 'FAILURE')
+        self.assertEqual(verify_photos.call_count, 1)
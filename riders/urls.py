@@ -55,6 +55,7 @@ urlpatterns = [
     
     # Photo Verification endpoints
     path('riders/<int:rider_id>/verify-photos/', photo_views.verify_rider_photos, name='verify_rider_photos'),
+    path('riders/verify-photos/<str:job_id>/status/', photo_views.photo_verification_job_status, name='photo_verification_job_status'),
     path('riders/<int:rider_id>/photo-verification-report/', photo_views.get_photo_verification_report, name='photo_verification_report'),
     path('riders/<int:rider_id>/approve-photos/', photo_views.approve_photo_verification, name='approve_photo_verification'),
     path('enumerator/pending-photo-verification/', photo_views.get_riders_pending_photo_verification, name='pending_photo_verification'),
@@ -10,7 +10,8 @@ from datetime import timedelta
 from rest_framework.authtoken.models import Token
 from .models import (Rider, Lesson, RiderProgress, RiderApplication, Enumerator, 
                      DigitalLiteracyModule, SessionSchedule, SessionAttendance, 
-                     DigitalLiteracyProgress, Stage, StageRiderAssignment, DigitalSkillsPoints)
+                     DigitalLiteracyProgress, Stage, StageRiderAssignment, DigitalSkillsPoints,
+                     distance_in_meters)
 from .services.notification_service import FCMService
 
 def verify_firebase_token(request):
@@ -233,29 +234,37 @@ def submit_onboarding(request):
         age = request.data.get('age')  # Keep for backward compatibility
         
         # Use age bracket if provided, otherwise convert age to bracket
-        if age_bracket:
-            rider.age_bracket = age_bracket
-        elif age:
+        if not age_bracket and age:
             # Convert exact age to bracket for backward compatibility
             age = int(age)
             if 18 <= age <= 23:
-                rider.age_bracket = '18-23'
+                age_bracket = '18-23'
             elif 24 <= age <= 29:
-                rider.age_bracket = '24-29'
+                age_bracket = '24-29'
             elif 30 <= age <= 35:
-                rider.age_bracket = '30-35'
+                age_bracket = '30-35'
             elif 36 <= age <= 41:
-                rider.age_bracket = '36-41'
+                age_bracket = '36-41'
             elif 42 <= age <= 47:
-                rider.age_bracket = '42-47'
+                age_bracket = '42-47'
             elif 48 <= age <= 53:
-                rider.age_bracket = '48-53'
+                age_bracket = '48-53'
             elif 54 <= age <= 59:
-                rider.age_bracket = '54-59'
+                age_bracket = '54-59'
             elif 60 <= age <= 65:
-                rider.age_bracket = '60-65'
+                age_bracket = '60-65'
             else:
-                rider.age_bracket = '66+'
+                age_bracket = '66+'
+        
+        if age_bracket:
+            # Accept both '18-23' and the display form '18-23 (Young Adult)'
+            age_bracket_code = Rider.AGE_BRACKET_BY_LABEL.get(str(age_bracket).split(' ')[0])
+            if age_bracket_code is None:
+                return Response(
+                    {'error': f'Invalid age bracket: {age_bracket}'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            rider.age_bracket = age_bracket_code
         
         rider.age = age  # Keep for migration purposes
         rider.location = request.data.get('location')
@@ -442,7 +451,7 @@ def admin_pending_riders(request):
         )
     
     # Get riders with PENDING_APPROVAL status
-    pending_riders = Rider.objects.filter(status=Rider.PENDING_APPROVAL)
+    pending_riders = Rider.objects.for_list().filter(status=Rider.PENDING_APPROVAL)
     
     riders_data = []
     for rider in pending_riders:
@@ -558,7 +567,7 @@ def admin_approve_rider(request, rider_id):
         rider.status = Rider.APPROVED
         # Note: approved_by is for Enumerator, admin approval doesn't set this field
         rider.approved_at = timezone.now()
-        rider.save()
+        rider.save(update_fields=['unique_id', 'status', 'approved_at', 'updated_at'])
         
         # Update application record
         try:
@@ -797,7 +806,7 @@ def enumerator_assigned_riders(request):
         )
     
     # Get assigned riders
-    assigned_riders = enumerator.assigned_riders.all()
+    assigned_riders = enumerator.get_assigned_riders()
     
     riders_data = []
     for rider in assigned_riders:
@@ -845,7 +854,7 @@ def enumerator_pending_riders(request):
         )
     
     # Get pending riders assigned to this enumerator
-    pending_riders = enumerator.assigned_riders.filter(status=Rider.PENDING_APPROVAL)
+    pending_riders = enumerator.get_pending_riders()
     
     riders_data = []
     for rider in pending_riders:
@@ -907,7 +916,7 @@ def enumerator_approve_rider(request, rider_id):
         rider.status = Rider.APPROVED
         rider.approved_by = enumerator
         rider.approved_at = timezone.now()
-        rider.save()
+        rider.save(update_fields=['unique_id', 'status', 'approved_by', 'approved_at', 'updated_at'])
         
         # Update application record
         try:
@@ -1734,20 +1743,20 @@ def admin_pending_riders_by_enumerator(request):
     
     try:
         # Get all enumerators with their pending riders
-        enumerators = Enumerator.objects.prefetch_related(
-            'assigned_riders__application'
-        ).filter(status=Enumerator.ACTIVE)
+        enumerators = Enumerator.objects.prefetch_related(models.Prefetch(
+            'assigned_riders',
+            queryset=Rider.objects.for_list().filter(status=Rider.PENDING_APPROVAL),
+            to_attr='pending_riders',
+        )).filter(status=Enumerator.ACTIVE)
         
         enumerator_groups = []
         total_pending = 0
         
         for enumerator in enumerators:
-            # Get pending riders for this enumerator
-            pending_riders = enumerator.assigned_riders.filter(
-                status=Rider.PENDING_APPROVAL
-            ).select_related('assigned_enumerator').prefetch_related('application')
+            # Pending riders were prefetched with the enumerators
+            pending_riders = enumerator.pending_riders
             
-            if pending_riders.exists():
+            if pending_riders:
                 riders_data = []
                 for rider in pending_riders:
                     # Get application info
@@ -1795,10 +1804,10 @@ def admin_pending_riders_by_enumerator(request):
                 total_pending += len(riders_data)
         
         # Add enumerators with no pending riders for completeness
-        unassigned_pending = Rider.objects.filter(
+        unassigned_pending = Rider.objects.for_list().filter(
             status=Rider.PENDING_APPROVAL,
             assigned_enumerator__isnull=True
-        ).select_related('assigned_enumerator').prefetch_related('application')
+        )
         
         if unassigned_pending.exists():
             riders_data = []
@@ -1939,7 +1948,7 @@ def upcoming_training_sessions(request):
             scheduled_date__gte=timezone.now(),
             scheduled_date__lte=timezone.now() + timedelta(days=30),
             status='SCHEDULED'
-        ).select_related('session__module', 'trainer').order_by('scheduled_date')
+        ).select_related('session__module', 'trainer').with_counts().order_by('scheduled_date')
         
         sessions_data = []
         for schedule in upcoming_schedules:
@@ -2069,29 +2078,8 @@ def register_attendance(request):
             return Response({'error': 'Invalid trainer ID. Please check and try again.'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Calculate distance from venue
-        def calculate_distance(lat1, lon1, lat2, lon2):
-            if not all([lat1, lon1, lat2, lon2]):
-                return None
-            
-            from math import radians, cos, sin, asin, sqrt
-            
-            # Convert to radians
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            
-            # Haversine formula
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            r = 6371  # Radius of earth in kilometers
-            
-            return c * r * 1000  # Return distance in meters
-        
-        distance_from_venue = calculate_distance(
-            float(gps_latitude),
-            float(gps_longitude),
-            float(schedule.gps_latitude) if schedule.gps_latitude else 0,
-            float(schedule.gps_longitude) if schedule.gps_longitude else 0
+        distance_from_venue = distance_in_meters(
+            gps_latitude, gps_longitude, schedule.gps_latitude, schedule.gps_longitude
         )
         
         # Check if rider is within reasonable distance (500 meters)
@@ -2148,9 +2136,8 @@ def register_attendance(request):
         )
         
         if not created:
-            progress.sessions_attended += 1
             progress.last_session_attended = timezone.now()
-            progress.update_progress()
+            progress.update_progress(new_sessions=1)
         else:
             progress.update_progress()
         
@@ -2833,7 +2820,7 @@ def verify_stage_id(request):
         
         # Real stage verification using Stage model
         try:
-            stage = Stage.objects.get(stage_id=stage_id, status=Stage.ACTIVE)
+            stage = Stage.get_active(stage_id)
             is_valid = True
             stage_name = stage.name
             
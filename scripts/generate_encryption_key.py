@@ -38,10 +38,12 @@ def main():
     django_key = generate_django_secret_key()
     fernet_key = generate_fernet_key()
     salt = generate_salt()
+    pepper = generate_salt()
     
     print(f"SECRET_KEY={django_key}")
     print(f"ID_ENCRYPTION_KEY={fernet_key}")
     print(f"ID_HASH_SALT={salt}")
+    print(f"PIN_PEPPER={pepper}")
     
     print("\n" + "=" * 50)
     print("✅ Keys generated successfully!")
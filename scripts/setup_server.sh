@@ -150,6 +150,7 @@ CORS_ALLOWED_ORIGINS=https://your-domain.com,https://www.your-domain.com
 SECURE_SSL_REDIRECT=True
 ID_ENCRYPTION_KEY=generate-a-32-byte-key-here
 ID_HASH_SALT=generate-unique-salt-here
+PIN_PEPPER=generate-unique-pepper-here
 
 # Firebase Configuration
 FIREBASE_CREDENTIALS_PATH=/app/firebase-credentials.json